@@ -1,35 +1,367 @@
+import io
 import os
-import requests
+import hashlib
+import collections
+import sqlite3
+import asyncio
+import tarfile
+import tempfile
+import time
+import concurrent.futures
+import aiohttp
 import argparse
 
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+import lxml.etree
 import re
 
+from text_extract import element_text
+
+# Elements converted to Markdown-like text
+_CONTENT_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+                 'p', 'strong', 'b', 'em', 'i',
+                 'ul', 'ol', 'blockquote',
+                 'code', 'pre', 'span')
+
+# Elements removed, with all their content, before extracting text
+_STRIP_TAGS = ('script', 'style', 'nav', 'header', 'footer')
+
+# Headers sent with every page request
+_REQUEST_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml',
+}
+
+# Runs of slashes collapsed in URL paths
+_SLASHES_RE = re.compile(r'/{2,}')
+
+# Runs of blank lines collapsed in the extracted text
+_NL_RE = re.compile(r'\n{3,}')
+
+
+# Markdown-like formatter for each content tag
+_TAG_FORMATTERS = {
+    'h1': lambda tag: f"\n# {element_text(tag)}\n",
+    'h2': lambda tag: f"\n## {element_text(tag)}\n",
+    'h3': lambda tag: f"\n### {element_text(tag)}\n",
+    'h4': lambda tag: f"\n#### {element_text(tag)}\n",
+    'h5': lambda tag: f"\n##### {element_text(tag)}\n",
+    'h6': lambda tag: f"\n###### {element_text(tag)}\n",
+    'strong': lambda tag: f"**{element_text(tag)}**",
+    'b': lambda tag: f"**{element_text(tag)}**",
+    'em': lambda tag: f"*{element_text(tag)}*",
+    'i': lambda tag: f"*{element_text(tag)}*",
+    'ul': lambda tag: '\n' + '\n'.join(f"- {element_text(li)}" for li in tag.iter('li')) + '\n',
+    'ol': lambda tag: '\n' + '\n'.join(f"{i+1}. {element_text(li)}" for i, li in enumerate(tag.iter('li'))) + '\n',
+    'blockquote': lambda tag: f"\n> {element_text(tag)}\n",
+    'code': lambda tag: f"`{element_text(tag)}`",
+    'pre': lambda tag: f"\n```\n{element_text(tag)}\n```\n",
+    'p': lambda tag: f"\n{element_text(tag)}\n",
+    'span': lambda tag: f"\n{element_text(tag)}\n",
+}
+
+
+def convert_tag(tag):
+    """
+    Convert an element to Markdown-like formatted text.
+    
+    :param tag: lxml element
+    :return: Formatted text of the element
+    """
+    return _TAG_FORMATTERS.get(tag.tag, element_text)(tag)
+
+
+class HrefCollector:
+    """
+    lxml parser target that records anchor hrefs without building a tree.
+    """
+    def __init__(self):
+        self.hrefs = []
+
+    def start(self, tag, attrib):
+        if tag == 'a':
+            href = attrib.get('href')
+            if href is not None:
+                self.hrefs.append(href)
+
+    def close(self):
+        return self.hrefs
+
+
+def extract_hrefs(html_content):
+    """
+    Extract the href of every anchor in HTML content.
+    
+    :param html_content: HTML content to parse
+    :return: List of href values in document order
+    """
+    try:
+        return lxml.etree.fromstring(html_content, lxml.etree.HTMLParser(target=HrefCollector()))
+    except ValueError:
+        # lxml refuses str input that carries an XML encoding declaration
+        return lxml.etree.fromstring(html_content.encode('utf-8'), lxml.etree.HTMLParser(target=HrefCollector()))
+
+
+def iter_blocks(html_content):
+    """
+    Stream the content elements of a document in document order.
+    
+    The document is parsed incrementally; once the outermost content
+    element of a subtree has been yielded, together with the content
+    elements nested inside it, the subtree and its preceding siblings
+    are freed, so memory stays proportional to the current subtree.
+    Elements inside script, style, nav, header and footer are skipped.
+    
+    :param html_content: HTML content to parse
+    :return: Generator of lxml elements
+    """
+    events = lxml.etree.iterparse(io.BytesIO(html_content.encode('utf-8')), events=('end',),
+                                  tag=_CONTENT_TAGS + _STRIP_TAGS, html=True, encoding='utf-8')
+    blocks = 0
+    try:
+        for _, elem in events:
+            # Nested elements are handled with their outermost content
+            # ancestor, and stripped subtrees are ignored entirely
+            if elem.tag in _STRIP_TAGS or next(elem.iterancestors(*_CONTENT_TAGS, *_STRIP_TAGS), None) is not None:
+                continue
+            
+            blocks += 1
+            lxml.etree.strip_elements(elem, *_STRIP_TAGS, with_tail=False)
+            yield from elem.iter(*_CONTENT_TAGS)
+            
+            # Free the finished subtree and everything parsed before it
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+    except lxml.etree.XMLSyntaxError:
+        # Empty document
+        return
+    
+    # libxml2 stops silently at nesting depth 255, logging a fatal error
+    # that iterparse does not raise and huge_tree does not lift; finish the
+    # document from a full parse, skipping the blocks already yielded
+    if any(error.level >= lxml.etree.ErrorLevels.FATAL for error in events.error_log):
+        yield from iter_blocks_full(html_content, skip=blocks)
+
+
+def iter_blocks_full(html_content, skip=0):
+    """
+    Yield the content elements of a document from a full, unlimited-depth parse.
+    
+    Produces the same sequence as iter_blocks, for documents too deeply
+    nested for its streaming parse.
+    
+    :param html_content: HTML content to parse
+    :param skip: Number of outermost content elements to skip
+    :return: Generator of lxml elements
+    """
+    parser = lxml.etree.HTMLParser(huge_tree=True, encoding='utf-8')
+    root = lxml.etree.fromstring(html_content.encode('utf-8'), parser)
+    if root is None:
+        return
+    
+    # Outermost content elements outside stripped subtrees, in document order
+    blocks = [elem for elem in root.iter(*_CONTENT_TAGS)
+              if next(elem.iterancestors(*_CONTENT_TAGS, *_STRIP_TAGS), None) is None]
+    
+    for elem in blocks[skip:]:
+        lxml.etree.strip_elements(elem, *_STRIP_TAGS, with_tail=False)
+        yield from elem.iter(*_CONTENT_TAGS)
+
+
+def extract_clean_text(html_content):
+    """
+    Extract clean, readable text from HTML content with Markdown-like formatting.
+    
+    Defined at module level so it can run in worker processes.
+    
+    :param html_content: HTML content to parse
+    :return: Extracted and cleaned text with formatting
+    """
+    # Process the document with formatting, skipping script, style,
+    # and navigation elements
+    formatted_text = []
+    for element in iter_blocks(html_content):
+        formatted_text.append(convert_tag(element))
+    
+    # Join and clean up text
+    text = _NL_RE.sub('\n\n', '\n'.join(formatted_text)).strip()
+    
+    # Optional: Add some basic length filtering
+    return text if len(text) > 100 else ''
+
+
+def extract_page(html_content):
+    """
+    Extract both the clean text and the anchor hrefs of a page.
+    
+    Defined at module level so a worker process can do all the parsing
+    of a page in a single call.
+    
+    :param html_content: HTML content to parse
+    :return: Tuple of the extracted text and the list of href values
+    """
+    return extract_clean_text(html_content), extract_hrefs(html_content)
+
+
+class UrlFrontier:
+    def __init__(self, maxsize=10_000):
+        """
+        Queue of URLs waiting to be visited that spills to disk when full.
+        
+        Up to maxsize URLs are kept in memory; the rest go to a temporary
+        SQLite table keyed by URL fingerprint. Callers are expected to
+        deduplicate URLs before putting them (WebsiteTextExtractor does so
+        with its in-memory queued_urls set), so INSERT OR IGNORE is only a
+        safeguard. Spilling keeps pending URL strings off the heap, but
+        memory still grows by one fingerprint per discovered URL.
+        
+        :param maxsize: Maximum number of URLs kept in memory, at least 1
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.db = None
+        self.db_path = None
+        self.spilled = 0
+
+    def put(self, url, fingerprint):
+        """
+        Add a URL to the frontier.
+        
+        :param url: URL to visit
+        :param fingerprint: Fingerprint of the URL, used to deduplicate spilled URLs
+        """
+        try:
+            self.queue.put_nowait(url)
+        except asyncio.QueueFull:
+            self.spill(url, fingerprint)
+
+    def spill(self, url, fingerprint):
+        """
+        Store a URL in the on-disk overflow table.
+        
+        :param url: URL to visit
+        :param fingerprint: Fingerprint of the URL
+        """
+        if self.db is None:
+            fd, self.db_path = tempfile.mkstemp(suffix='.sqlite')
+            os.close(fd)
+            self.db = sqlite3.connect(self.db_path)
+            # Scratch database, durability is not needed
+            self.db.execute('PRAGMA journal_mode = OFF')
+            self.db.execute('PRAGMA synchronous = OFF')
+            self.db.execute('CREATE TABLE frontier (hash INTEGER PRIMARY KEY, url TEXT)')
+        
+        cursor = self.db.execute('INSERT OR IGNORE INTO frontier VALUES (?, ?)',
+                                 (int.from_bytes(fingerprint, 'big', signed=True), url))
+        self.spilled += cursor.rowcount
+
+    def refill(self):
+        """
+        Move spilled URLs back into memory while there is room.
+        """
+        free = self.maxsize - self.queue.qsize()
+        rows = self.db.execute('SELECT hash, url FROM frontier LIMIT ?', (free,)).fetchall()
+        self.db.executemany('DELETE FROM frontier WHERE hash = ?', [(row[0],) for row in rows])
+        self.spilled -= len(rows)
+        
+        for _, url in rows:
+            self.queue.put_nowait(url)
+
+    async def get(self):
+        """
+        Wait for the next URL to visit.
+        
+        :return: URL to visit
+        """
+        return await self.queue.get()
+
+    def task_done(self):
+        """
+        Mark a URL returned by get as processed.
+        """
+        # Refill before completing the task so join() never sees an empty
+        # queue while spilled URLs remain
+        if self.spilled and self.queue.qsize() <= self.maxsize // 2:
+            self.refill()
+        self.queue.task_done()
+
+    async def join(self):
+        """
+        Wait until every URL in the frontier has been processed.
+        """
+        await self.queue.join()
+
+    def close(self):
+        """
+        Remove the on-disk overflow table.
+        """
+        if self.db is not None:
+            self.db.close()
+            os.remove(self.db_path)
+            self.db = None
+
+
 class WebsiteTextExtractor:
-    def __init__(self, root_url, excluded_paths=None,output_dir= "extracted_text", max_pages=None):
+    def __init__(self, root_url, excluded_paths=None,output_dir= "extracted_text", max_pages=None, concurrency=50,
+                 per_host_concurrency=8, crawl_delay=0, compress=False):
         """
         Initialize the website text extractor.
         
         :param root_url: The starting URL of the website
         :param output_dir: Directory to save extracted text
         :param max_pages: Maximum number of pages to extract
+        :param concurrency: Maximum number of pages downloaded at once
+        :param per_host_concurrency: Maximum number of pages downloaded at once from a single host
+        :param crawl_delay: Seconds to wait after each download before reusing its host slot
+        :param compress: Save all pages into a single zstd-compressed tar archive
         """
         print(root_url, excluded_paths, output_dir, max_pages)
         output_dir = root_url.replace("https://", "").replace(".", "_")
         self.root_url = root_url
-        self.base_domain = urlparse(root_url).netloc
+        self.base_domain = urlparse(root_url).netloc.lower()
         self.output_dir = output_dir
         self.max_pages = max_pages
+        self.concurrency = concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.crawl_delay = crawl_delay
+        # Politeness limit per host, created on first use of each host
+        self.host_semaphores = collections.defaultdict(lambda: asyncio.Semaphore(self.per_host_concurrency))
+        self.session = None
+        self.pool = None
+        # Number of files saved so far per filename stem
+        self.name_counts = collections.Counter()
+        self.compress = compress
+        self.archive = None
+        self.archive_writer = None
+        self.max_retries = 2
+        self.backoff_factor = 0.2
+        # Fingerprints of visited URLs, see url_fingerprint
         self.visited_urls = set()
+        # Number of pages whose download returned content
+        self.pages_extracted = 0
+        # Fingerprints of every URL ever queued, visited ones included
+        self.queued_urls = set()
          
         # Compile excluded path patterns
         self.excluded_patterns = []
         if excluded_paths:
             self.excluded_patterns = [re.compile(pattern) for pattern in excluded_paths]
         
+        # Merge them into a single alternation when that cannot change their
+        # meaning: groups would renumber backreferences, and global inline
+        # flags are only allowed at the start of an expression
+        default_flags = re.compile('').flags
+        if len(self.excluded_patterns) > 1 and all(
+                pattern.groups == 0 and pattern.flags == default_flags
+                for pattern in self.excluded_patterns):
+            self.excluded_patterns = [re.compile('|'.join(
+                f'(?:{pattern.pattern})' for pattern in self.excluded_patterns))]
+        
         # Create output directory if it doesn't exist
-        os.makedirs(output_dir, exist_ok=True)
+        if not compress:
+            os.makedirs(output_dir, exist_ok=True)
     
     def normalize_url(self, url):
         """
@@ -38,11 +370,83 @@ class WebsiteTextExtractor:
         :param url: URL to normalize
         :return: Normalized path
         """
-        parsed_url = urlparse(url)
-        # Remove leading/trailing slashes, convert to lowercase
-        normalized_path = parsed_url.path.strip('/').lower()
+        return self.normalize_path(urlparse(url).path)
+
+    def normalize_path(self, path):
+        """
+        Normalize the path component of an already parsed URL.
+        
+        :param path: URL path to normalize
+        :return: Normalized path
+        """
+        # Collapse repeated slashes, remove leading/trailing slashes,
+        # convert to lowercase
+        normalized_path = _SLASHES_RE.sub('/', path).strip('/').lower()
         return normalized_path if normalized_path else 'index'
 
+    def canonical_url(self, parsed_url, normalized_path):
+        """
+        Build the canonical form of a URL used to deduplicate pages.
+        
+        Scheme, query and fragment are ignored, matching how pages are
+        named on disk, so only the lowercased host and the normalized path
+        distinguish two pages.
+        
+        :param parsed_url: ParseResult of the URL
+        :param normalized_path: Path of the URL as returned by normalize_path
+        :return: Canonical URL string
+        """
+        return f"{parsed_url.netloc.lower()}/{normalized_path}"
+
+    def url_fingerprint(self, url):
+        """
+        Compute a compact fingerprint of the canonical URL.
+        
+        :param url: URL to fingerprint
+        :return: 8-byte digest identifying the canonical URL
+        """
+        parsed_url = urlparse(url)
+        return self.parsed_url_fingerprint(parsed_url, self.normalize_path(parsed_url.path))
+
+    def parsed_url_fingerprint(self, parsed_url, normalized_path):
+        """
+        Compute a compact fingerprint of an already parsed URL.
+        
+        :param parsed_url: ParseResult of the URL
+        :param normalized_path: Path of the URL as returned by normalize_path
+        :return: 8-byte digest identifying the canonical URL
+        """
+        return hashlib.blake2b(self.canonical_url(parsed_url, normalized_path).encode(), digest_size=8).digest()
+
+    def is_visited(self, fingerprint):
+        """
+        Check if a URL fingerprint has already been visited.
+        
+        :param fingerprint: Fingerprint from url_fingerprint
+        :return: Boolean indicating if the URL was visited
+        """
+        return fingerprint in self.visited_urls
+
+    def mark_visited(self, fingerprint):
+        """
+        Record a URL fingerprint as visited.
+        
+        :param fingerprint: Fingerprint from url_fingerprint
+        """
+        self.visited_urls.add(fingerprint)
+
+    def enqueue(self, frontier, url, fingerprint):
+        """
+        Add a URL to the frontier unless it has been queued before.
+        
+        :param frontier: Frontier of URLs waiting to be visited
+        :param url: URL to visit
+        :param fingerprint: Fingerprint from url_fingerprint
+        """
+        if fingerprint not in self.queued_urls:
+            self.queued_urls.add(fingerprint)
+            frontier.put(url, fingerprint)
+
     def is_valid_url(self, url):
         """
         Check if the URL is valid and not excluded.
@@ -50,108 +454,67 @@ class WebsiteTextExtractor:
         :param url: URL to validate
         :return: Boolean indicating if URL is valid
         """
-        parsed_url = urlparse(url)
+        return self.valid_url_fingerprint(urlparse(url)) is not None
+
+    def valid_url_fingerprint(self, parsed_url):
+        """
+        Fingerprint an already parsed URL if it is valid and not excluded.
         
-        # Check domain
-        if parsed_url.netloc != self.base_domain:
-            return False
+        :param parsed_url: ParseResult of the URL to validate
+        :return: Fingerprint of the URL, or None if the URL is not valid
+        """
+        # Check domain, host names are case-insensitive
+        if parsed_url.netloc.lower() != self.base_domain:
+            return None
         
         # Check scheme
         if parsed_url.scheme not in ['http', 'https']:
-            return False
+            return None
         
         # Normalize path
-        normalized_path = self.normalize_url(url)
+        normalized_path = self.normalize_path(parsed_url.path)
         
         # Check against excluded path patterns
         for pattern in self.excluded_patterns:
             if pattern.search(normalized_path):
-                return False
+                return None
         
-        # Check if URL has already been visited
-        if normalized_path in self.visited_urls:
-            return False
+        # Check if URL has already been queued, which covers every visited URL
+        fingerprint = self.parsed_url_fingerprint(parsed_url, normalized_path)
+        if fingerprint in self.queued_urls:
+            return None
         
-        return True
+        return fingerprint
 
 
-    def download_page(self, url):
+    async def download_page(self, url):
         """
         Download the content of a single page.
         
+        Connection failures and timeouts are retried with exponential
+        backoff; HTTP error statuses are not. Responses that are not HTML
+        are dropped before their body is read.
+        
         :param url: URL of the page to download
         :return: Downloaded content or None
         """
-        try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            return response.text
-        except requests.RequestException as e:
-            print(f"Error downloading {url}: {e}")
-            return None
-
-    def extract_clean_text(self, html_content):
-        """
-        Extract clean, readable text from HTML content with Markdown-like formatting.
-        
-        :param html_content: HTML content to parse
-        :return: Extracted and cleaned text with formatting
-        """
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Remove script, style, and navigation elements
-        for script in soup(["script", "style", "nav", "header", "footer"]):
-            script.decompose()
-        
-        # Helper function to convert HTML to Markdown-like formatting
-        def convert_tag(tag):
-            if tag.name == 'h1':
-                return f"\n# {tag.get_text(strip=True)}\n"
-            elif tag.name == 'h2':
-                return f"\n## {tag.get_text(strip=True)}\n"
-            elif tag.name == 'h3':
-                return f"\n### {tag.get_text(strip=True)}\n"
-            elif tag.name == 'h4':
-                return f"\n#### {tag.get_text(strip=True)}\n"
-            elif tag.name == 'h5':
-                return f"\n##### {tag.get_text(strip=True)}\n"
-            elif tag.name == 'h6':
-                return f"\n###### {tag.get_text(strip=True)}\n"
-            elif tag.name == 'strong' or tag.name == 'b':
-                return f"**{tag.get_text(strip=True)}**"
-            elif tag.name == 'em' or tag.name == 'i':
-                return f"*{tag.get_text(strip=True)}*"
-            elif tag.name == 'ul':
-                return '\n' + '\n'.join(f"- {li.get_text(strip=True)}" for li in tag.find_all('li')) + '\n'
-            elif tag.name == 'ol':
-                return '\n' + '\n'.join(f"{i+1}. {li.get_text(strip=True)}" for i, li in enumerate(tag.find_all('li'))) + '\n'
-            elif tag.name == 'blockquote':
-                return f"\n> {tag.get_text(strip=True)}\n"
-            elif tag.name == 'code':
-                return f"`{tag.get_text(strip=True)}`"
-            elif tag.name == 'pre':
-                return f"\n```\n{tag.get_text(strip=True)}\n```\n"
-            elif tag.name == 'p':
-                return f"\n{tag.get_text(strip=True)}\n"
-            elif tag.name == 'span':
-                return f"\n{tag.get_text(strip=True)}\n"
-                
-            return tag.get_text(strip=True)
-        
-        # Process the document with formatting
-        formatted_text = []
-        for element in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 
-                                      'p', 'strong', 'b', 'em', 'i', 
-                                      'ul', 'ol', 'blockquote', 
-                                      'code', 'pre','span']):
-            formatted_text.append(convert_tag(element))
-        
-        # Join and clean up text
-        text = '\n'.join(formatted_text)
-        text = re.sub(r'\n{3,}', '\n\n', text).strip()
-        
-        # Optional: Add some basic length filtering
-        return text if len(text) > 100 else ''
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self.session.get(url) as response:
+                    response.raise_for_status()
+                    content_type = response.headers.get('Content-Type', 'text/html')
+                    if 'html' not in content_type.lower():
+                        print(f"Skipping {url}: not HTML ({content_type})")
+                        return None
+                    return await response.text(errors='replace')
+            except aiohttp.ClientResponseError as e:
+                print(f"Error downloading {url}: {e}")
+                return None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == self.max_retries:
+                    print(f"Error downloading {url}: {e}")
+                    return None
+                await asyncio.sleep(self.backoff_factor * 2 ** attempt)
 
     def save_text(self, url, text):
         """
@@ -171,78 +534,188 @@ class WebsiteTextExtractor:
         # Replace invalid filename characters
         safe_path = path.replace('/', '_').replace('\\', '_')
         
-        # Ensure unique filename
-        filename = os.path.join(self.output_dir, f"{safe_path}.md")
+        # Archive members only need to be unique within this crawl
+        if self.archive is not None:
+            counter = self.name_counts[safe_path]
+            self.name_counts[safe_path] += 1
+            suffix = f"_{counter}" if counter else ''
+            data = text.encode('utf-8')
+            info = tarfile.TarInfo(f"{safe_path}{suffix}.md")
+            info.size = len(data)
+            info.mtime = time.time()
+            self.archive.addfile(info, io.BytesIO(data))
+            return
         
-        # Ensure unique filename if exists
-        counter = 1
-        while os.path.exists(filename):
-            filename = os.path.join(self.output_dir, f"{safe_path}_{counter}.md")
-            counter += 1
+        # Ensure unique filename, counting names in memory and only
+        # probing the filesystem when a file predates this crawl
+        while True:
+            counter = self.name_counts[safe_path]
+            self.name_counts[safe_path] += 1
+            suffix = f"_{counter}" if counter else ''
+            filename = os.path.join(self.output_dir, f"{safe_path}{suffix}.md")
+            try:
+                fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+                break
+            except FileExistsError:
+                continue
         
-        with open(filename, 'w', encoding='utf-8') as f:
+        with open(fd, 'w', encoding='utf-8') as f:
             f.write(text)
 
+    def open_archive(self):
+        """
+        Open the zstd-compressed tar archive that pages are saved into.
+        """
+        # Only compressed output needs zstandard, so import it on demand
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Compressed output (-z/--compress) requires the zstandard package; "
+                              "install it with: pip install zstandard") from None
+        
+        archive_path = f"{os.path.normpath(self.output_dir)}.tar.zst"
+        if os.path.dirname(archive_path):
+            os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+        
+        self.archive_writer = zstandard.ZstdCompressor(level=3, threads=-1).stream_writer(
+            open(archive_path, 'wb'))
+        self.archive = tarfile.open(fileobj=self.archive_writer, mode='w|')
+
+    def close_archive(self):
+        """
+        Finish the tar archive and flush the last compressed frame.
+        """
+        if self.archive is not None:
+            self.archive.close()
+            self.archive_writer.close()
+            self.archive = None
+            self.archive_writer = None
+
     def extract_links(self, html_content, base_url):
         """
         Extract all links from HTML content.
         
         :param html_content: HTML content to parse
         :param base_url: Base URL for resolving relative links
-        :return: Set of unique links
+        :return: Dict mapping each unique valid link to its fingerprint
+        """
+        return self.resolve_links(extract_hrefs(html_content), base_url)
+
+    def resolve_links(self, hrefs, base_url):
+        """
+        Resolve and validate href values extracted from a page.
+        
+        :param hrefs: href values as found in the page
+        :param base_url: Base URL for resolving relative links
+        :return: Dict mapping each unique valid link to its fingerprint
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
-        links = set()
+        links = {}
         
-        for a_tag in soup.find_all('a', href=True):
-            link = urljoin(base_url, a_tag['href'])
-            parsed_link = urlparse(link)
+        for href in hrefs:
+            # Parse once, without the fragment identifier, and validate the result
+            parsed_link = urlparse(urljoin(base_url, href))._replace(fragment='')
             
-            # Remove fragment identifiers
-            link = parsed_link._replace(fragment='').geturl()
-            
-            if self.is_valid_url(link):
-                links.add(link)
+            fingerprint = self.valid_url_fingerprint(parsed_link)
+            if fingerprint is not None:
+                links[parsed_link.geturl()] = fingerprint
         
         return links
 
-    def extract_website_text(self):
+    async def crawl_page(self, semaphore, frontier, current_url):
         """
-        Extract text from entire website starting from root URL.
+        Download a single page, save its text and queue its links.
+        
+        :param semaphore: Semaphore bounding concurrent downloads
+        :param frontier: Frontier of URLs waiting to be visited
+        :param current_url: URL of the page to crawl
         """
-        to_visit = {self.root_url}
+        # Fingerprint the normalized URL path
+        fingerprint = self.url_fingerprint(current_url)
         
-        while to_visit and len(self.visited_urls) < self.max_pages:
-            current_url = to_visit.pop()
-            
-            # Normalize current URL path
-            normalized_path = self.normalize_url(current_url)
-            
-            # Skip if already visited
-            if normalized_path in self.visited_urls:
-                continue
+        # Skip if already visited or the page limit has been reached
+        if self.is_visited(fingerprint) or self.pages_extracted >= self.max_pages:
+            return
+        
+        # Claim the URL before downloading so other workers skip it; only
+        # pages that return content count towards max_pages
+        self.mark_visited(fingerprint)
+        
+        print(f"Extracting text from: {current_url}")
+        
+        # Take the host slot first so a busy host never holds global slots
+        async with self.host_semaphores[urlparse(current_url).netloc.lower()]:
+            async with semaphore:
+                content = await self.download_page(current_url)
+            if self.crawl_delay:
+                await asyncio.sleep(self.crawl_delay)
+        
+        if content:
+            # Other workers may have reached the page limit during the download
+            if self.pages_extracted >= self.max_pages:
+                return
+            self.pages_extracted += 1
             
-            print(f"Extracting text from: {current_url}")
+            # Parse the page in the process pool so parsing overlaps
+            # downloads, runs on every core and never blocks the event loop
+            loop = asyncio.get_running_loop()
+            text, hrefs = await loop.run_in_executor(self.pool, extract_page, content)
             
-            content = self.download_page(current_url)
+            # Save text if it's not empty
+            if text:
+                self.save_text(current_url, text)
             
-            if content:
-                # Extract clean text
-                text = self.extract_clean_text(content)
-                
-                # Save text if it's not empty
-                if text:
-                    self.save_text(current_url, text)
-                
-                # Mark as visited
-                self.visited_urls.add(normalized_path)
-                
-                # Extract and add new links
-                new_links = self.extract_links(content, current_url)
-                to_visit.update(link for link in new_links 
-                                if self.is_valid_url(link))
-        
-        print(f"Extracted text from {len(self.visited_urls)} pages.")
+            # Add new links, already validated by resolve_links
+            for link, fingerprint in self.resolve_links(hrefs, current_url).items():
+                self.enqueue(frontier, link, fingerprint)
+
+    async def worker(self, semaphore, frontier):
+        """
+        Crawl URLs from the frontier until cancelled.
+        
+        :param semaphore: Semaphore bounding concurrent downloads
+        :param frontier: Frontier of URLs waiting to be visited
+        """
+        while True:
+            current_url = await frontier.get()
+            try:
+                await self.crawl_page(semaphore, frontier, current_url)
+            except Exception as e:
+                print(f"Error crawling {current_url}: {e}")
+            finally:
+                frontier.task_done()
+
+    async def extract_website_text(self):
+        """
+        Extract text from entire website starting from root URL.
+        """
+        frontier = UrlFrontier()
+        self.enqueue(frontier, self.root_url, self.url_fingerprint(self.root_url))
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        # One pooled session for the whole crawl so keep-alive connections
+        # and resolved addresses are reused across pages
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host_concurrency,
+                                         keepalive_timeout=30, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=10)
+        if self.compress:
+            self.open_archive()
+        try:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count()) as self.pool:
+                async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                             headers=_REQUEST_HEADERS) as self.session:
+                    workers = [asyncio.create_task(self.worker(semaphore, frontier))
+                               for _ in range(self.concurrency)]
+                    
+                    # Wait until every queued URL has been processed, then stop the workers
+                    await frontier.join()
+                    for task in workers:
+                        task.cancel()
+                    await asyncio.gather(*workers, return_exceptions=True)
+        finally:
+            frontier.close()
+            self.close_archive()
+        
+        print(f"Extracted text from {self.pages_extracted} pages.")
 
 
 def main():
@@ -254,6 +727,14 @@ def main():
                         help='Output directory for extracted text (default: extracted_text)')
     parser.add_argument('-x', '--exclude', nargs='+', 
                         help='Path patterns to exclude (regex)', default=[])
+    parser.add_argument('-c', '--concurrency', type=int, default=50, 
+                        help='Maximum number of concurrent downloads (default: 50)')
+    parser.add_argument('-p', '--per-host', type=int, default=8, 
+                        help='Maximum number of concurrent downloads per host (default: 8)')
+    parser.add_argument('-d', '--delay', type=float, default=0, 
+                        help='Seconds to wait between downloads from the same host slot (default: 0)')
+    parser.add_argument('-z', '--compress', action='store_true', 
+                        help='Save pages into a single zstd-compressed tar archive')
 
     
 
@@ -262,13 +743,17 @@ def main():
         root_url=args.url, 
         max_pages=args.max_pages,
         output_dir=args.output_dir,
-        excluded_paths=args.exclude
+        excluded_paths=args.exclude,
+        concurrency=args.concurrency,
+        per_host_concurrency=args.per_host,
+        crawl_delay=args.delay,
+        compress=args.compress
     )
 
     # Example usage
     # root_url = 'https://likeminds.community'  # Replace with your target website
     # extractor = WebsiteTextExtractor(root_url, max_pages=50)
-    extractor.extract_website_text()
+    asyncio.run(extractor.extract_website_text())
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,19 @@
+"""
+Text collection for lxml elements, the innermost loop of text extraction.
+
+This is plain Python and is imported as is. It can optionally be compiled
+in place with ``cythonize -i text_extract.py``; the compiled module takes
+precedence on import and is built from this same source.
+"""
+
+
+def element_text(element):
+    """
+    Return the text of an element with whitespace collapsed.
+    
+    :param element: lxml element
+    :return: Text content of the element and its descendants
+    """
+    # Leaf elements, the common case, carry all their text in .text
+    text = "".join(element.itertext()) if len(element) else (element.text or '')
+    return " ".join(text.split())